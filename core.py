@@ -1,9 +1,17 @@
-import os, sys, shutil, json
-import appdirs, subprocess
+import os, re, sys, shutil, json, threading, time, queue
+import appdirs, subprocess, tempfile
 import yt_dlp
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Optional, Any
 from pathvalidate import sanitize_filename
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional: the standard json module is used when it isn't installed
+    orjson = None
+
 # --- Constants and Configurations ---
 # yt-dlp configuration for fetching playlist metadata quickly
 yt_config = {
@@ -21,8 +29,52 @@ yt_config = {
 PLAYLIST_URL_TYPE = "https://www.youtube.com/playlist?list="
 VIDEO_URL_TYPE1 = "https://www.youtube.com/watch?v="
 VIDEO_URL_TYPE2 = "https://youtu.be/"
+# Prefixes of the URLs accepted as YouTube links
+YOUTUBE_URL_PREFIXES = (
+    "https://www.youtube.com/",
+    "https://youtube.com/",
+    "https://m.youtube.com/",
+    "https://music.youtube.com/",
+    VIDEO_URL_TYPE2
+)
+# Playlist ID in the query string of a URL
+PLAYLIST_ID_RE = re.compile(r'[?&]list=([A-Za-z0-9_-]+)')
 APP_NAME = "YouTubePlaylistManager"
 
+# Supported output formats
+AUDIO_FORMATS = frozenset({"mp3", "m4a", "flac", "opus", "wav"})
+VIDEO_FORMATS = frozenset({"mp4", "mkv", "webm"})
+
+# aria2c options: up to 16 connections per file, split into 1 MiB ranges
+ARIA2_ARGS = ["-x", "16", "-s", "16", "-k", "1M"]
+
+# Metadata extractors, one per thread: building a YoutubeDL loads every extractor,
+# so it is done once and reused, but instances are not meant to be shared between threads
+_metadata_ydl = threading.local()
+
+# Guards the playlists title cache, which several download threads may update at once
+_playlists_cache_lock = threading.Lock()
+# Parsed playlists title cache, read again only when the file changes on disk.
+# "signature" is (mtime, inode, size) of the file the data was read from or written to
+_playlists_cache: dict[str, Any] = {"signature": None, "data": {}}
+
+# Playlist metadata younger than this (in seconds) is reused instead of asking YouTube again
+METADATA_CACHE_TTL = 6 * 60 * 60
+
+@dataclass(slots=True, frozen=True)
+class PlaylistError:
+    """
+    An error returned by the download/update functions.
+
+    Attributes:
+        source: What the error is about (playlist title, URL or "Single Video")
+        kind: Short description, or the title of the video that failed
+        message: Details of the error
+    """
+    source: str
+    kind: str
+    message: str
+
 # --- Path Management Functions ---
 def get_app_data_dir() -> str:
     """
@@ -50,6 +102,62 @@ def get_playlist_state_path(playlist_title: str) -> str:
     playlist_dir = get_playlist_data_dir(playlist_title)
     return os.path.join(playlist_dir, "state.json")
 
+def read_json_file(path: str) -> Any:
+    """
+    Reads a JSON file, using orjson when available.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        json.JSONDecodeError: If the file is not valid JSON (orjson's error is a subclass).
+    """
+    if orjson:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def write_json_file(path: str, data: Any) -> None:
+    """
+    Writes data to a JSON file, using orjson when available.
+    Keys are sorted so that successive saves produce stable diffs.
+
+    The data is written to a temporary file in the same folder, which then
+    replaces the target atomically: an interrupted save never leaves a
+    truncated file behind.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        if orjson:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=4, sort_keys=True)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def load_playlist_state(playlist_title: str) -> dict:
+    """
+    Loads the state.json file of a playlist.
+
+    Returns:
+        dict: The playlist state, or an empty dictionary if the file is missing or unreadable.
+    """
+    try:
+        return read_json_file(get_playlist_state_path(playlist_title))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_playlist_state(playlist_title: str, state: dict) -> None:
+    """
+    Writes the state.json file of a playlist.
+    """
+    write_json_file(get_playlist_state_path(playlist_title), state)
+
 def get_temp_dir(playlist_title: str) -> str:
     """
     Creates a clean temporary directory for download operations.
@@ -62,7 +170,175 @@ def get_temp_dir(playlist_title: str) -> str:
     os.makedirs(temp_dir, exist_ok=True)
     return temp_dir
 
+def get_playlists_cache_path() -> str:
+    """
+    Returns the path to the JSON file mapping playlist IDs to their titles.
+    """
+    return os.path.join(get_app_data_dir(), "playlists_cache.json")
+
+def get_metadata_cache_dir() -> str:
+    """
+    Returns the directory holding recently fetched playlist metadata, one JSON file per playlist.
+    """
+    return os.path.join(get_app_data_dir(), "metadata")
+
+def get_metadata_cache_path(playlist_id: str) -> str:
+    """
+    Returns the path to the JSON file holding the cached metadata of a playlist.
+    """
+    return os.path.join(get_metadata_cache_dir(), f"{playlist_id}.json")
+
+# --- Playlist Cache ---
+def get_playlist_id(playlist_url: str) -> str:
+    """
+    Extracts the playlist ID from a YouTube playlist URL, or "" if it has none.
+    """
+    match = PLAYLIST_ID_RE.search(playlist_url)
+    return match.group(1) if match else ""
+
+def get_cached_playlist_title(playlist_url: str) -> Optional[str]:
+    """
+    Looks up the title of a playlist already seen by the application.
+
+    Args:
+        playlist_url: YouTube playlist URL.
+
+    Returns:
+        str: The cached playlist title, or None if the playlist is not cached.
+    """
+    return load_playlists_cache().get(get_playlist_id(playlist_url))
+
+def load_playlists_cache() -> dict:
+    """
+    Returns the playlists title cache (playlist ID -> title).
+
+    The parsed file is kept in memory and read again only when it changes on
+    disk, since it is looked up several times per URL. Mtimes can be coarse,
+    so the inode (new on every atomic write) and size are compared too.
+    The returned dictionary is shared: it must not be modified.
+    """
+    try:
+        signature = get_file_signature(get_playlists_cache_path())
+    except FileNotFoundError:
+        return {}
+
+    if signature != _playlists_cache["signature"]:
+        try:
+            data = read_json_file(get_playlists_cache_path())
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        _playlists_cache.update(signature=signature, data=data)
+
+    return _playlists_cache["data"]
+
+def get_file_signature(path: str) -> tuple[int, int, int]:
+    """
+    Returns (mtime, inode, size) of a file, used to tell whether it changed.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+def cache_playlist_title(playlist_url: str, playlist_title: str) -> None:
+    """
+    Stores the title of a playlist so later runs can resolve it without a network call.
+    Write failures are ignored, as the cache is only an optimization.
+
+    Args:
+        playlist_url: YouTube playlist URL.
+        playlist_title: Title of the playlist as reported by YouTube.
+    """
+    cache_path = get_playlists_cache_path()
+
+    # Playlists are downloaded in parallel: keep the read-modify-write of the cache in one piece
+    with _playlists_cache_lock:
+        # Copy: the cached dictionary is shared with the readers
+        cache = dict(load_playlists_cache())
+        playlist_id = get_playlist_id(playlist_url)
+        if cache.get(playlist_id) == playlist_title:
+            return
+
+        cache[playlist_id] = playlist_title
+        try:
+            write_json_file(cache_path, cache)
+            # Remember what was just written: with coarse mtimes the next read couldn't tell it changed
+            _playlists_cache.update(signature=get_file_signature(cache_path), data=cache)
+        except OSError:
+            # The cache only saves network calls later: failing to write it (disk full,
+            # read-only data directory) must not stop a download or update
+            pass
+
+def get_cached_playlist_info(playlist_url: str, max_age: float = METADATA_CACHE_TTL) -> Optional[dict]:
+    """
+    Looks up the metadata of a playlist fetched recently.
+
+    Args:
+        playlist_url: YouTube playlist URL.
+        max_age: Maximum age in seconds of the cached metadata.
+
+    Returns:
+        dict: The metadata as returned by fetch_online_playlist_info, or None
+              if it is not cached or older than max_age.
+    """
+    playlist_id = get_playlist_id(playlist_url)
+    if not playlist_id:
+        return None
+
+    cache_path = get_metadata_cache_path(playlist_id)
+    try:
+        # The file's modification time is the time the metadata was fetched
+        if time.time() - os.path.getmtime(cache_path) > max_age:
+            return None
+        return read_json_file(cache_path)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def cache_playlist_info(playlist_url: str, info: dict) -> None:
+    """
+    Stores the metadata of a playlist, see get_cached_playlist_info.
+
+    Each playlist has its own file, written atomically, so fetches of
+    different playlists never wait for each other.
+
+    Args:
+        playlist_url: YouTube playlist URL.
+        info: Metadata as returned by fetch_online_playlist_info.
+    """
+    playlist_id = get_playlist_id(playlist_url)
+    if not playlist_id:
+        return
+
+    os.makedirs(get_metadata_cache_dir(), exist_ok=True)
+    write_json_file(get_metadata_cache_path(playlist_id), info)
+
+def clear_metadata_cache() -> tuple[bool, str]:
+    """
+    Deletes the cached playlist metadata, so the next lookups go to YouTube.
+
+    Returns:
+        tuple: (success, message)
+    """
+    try:
+        shutil.rmtree(get_metadata_cache_dir())
+        return (True, "Metadata cache cleared.")
+    except FileNotFoundError:
+        return (True, "Metadata cache is already empty.")
+    except Exception as e:
+        return (False, f"An error occurred while clearing the metadata cache: {e}")
+
 # --- Media Operations ---
+def get_metadata_ydl() -> yt_dlp.YoutubeDL:
+    """
+    Returns the YoutubeDL instance (using yt_config) that the current thread uses
+    to fetch metadata, creating it on first use.
+    """
+    ydl = getattr(_metadata_ydl, "instance", None)
+    if ydl is None:
+        ydl = _metadata_ydl.instance = yt_dlp.YoutubeDL(yt_config)
+    return ydl
+
 def basic_info(playlist_url: str) -> dict[str, Any]:
     """
     Retrieve basic playlist information (entries list) via yt-dlp.
@@ -79,9 +355,8 @@ def basic_info(playlist_url: str) -> dict[str, Any]:
     """
     try:
         # Use the lightweight yt_config to fetch only metadata (no downloads)
-        with yt_dlp.YoutubeDL(yt_config) as ydl:
-            info = ydl.extract_info(playlist_url, download=False)
-            return info if info else {"entries": []}
+        info = get_metadata_ydl().extract_info(playlist_url, download=False)
+        return info if info else {"entries": []}
     except Exception as e:
         raise Exception(f"Could not fetch basic playlist info. Reason: {e}")
     
@@ -189,7 +464,7 @@ def get_options(format: str, quality: Optional[str]) -> dict:
     format = format.lower().strip()
 
     # --- GROUP 1: Audio Formats ---
-    if format in ['mp3', 'm4a', 'flac', 'opus', 'wav']:
+    if format in AUDIO_FORMATS:
         audio_quality = "bestaudio/best"
 
         audio_postprocessors = [
@@ -216,7 +491,7 @@ def get_options(format: str, quality: Optional[str]) -> dict:
         }
 
     # --- GROUP 2: Video Formats ---
-    elif format in ['mp4', 'mkv', 'webm']:
+    elif format in VIDEO_FORMATS:
         
         if quality is None:
             quality = "1080" 
@@ -244,14 +519,27 @@ def get_options(format: str, quality: Optional[str]) -> dict:
         return get_options("mp3", None)
         
 
-def make_config(path: str, format: str, quality: Optional[str]) -> dict:
+def is_aria2_available() -> bool:
+    """Tells whether the aria2c executable can be found on PATH."""
+    return shutil.which("aria2c") is not None
+
+def make_config(path: str, format: str, quality: Optional[str], use_aria2: bool = False, folder_per_video: bool = False) -> dict:
     """
     Creates the full yt-dlp configuration dictionary for a download.
+
+    When use_aria2 is True, files are fetched by aria2c with several
+    connections per file instead of yt-dlp's built-in HTTP downloader.
+
+    When folder_per_video is True, each video is saved in a subfolder of path
+    named after its ID, so one YoutubeDL can download several videos while
+    their files stay apart.
     """
     format_opts = get_options(format, quality)
 
+    output_dir = os.path.join(path, "%(id)s") if folder_per_video else path
+
     base_config = {
-        "outtmpl": os.path.join(path, "%(title)s.%(ext)s"),
+        "outtmpl": os.path.join(output_dir, "%(title)s.%(ext)s"),
         "add_metadata": True,
         "writethumbnail": True,
         "quiet": True,
@@ -273,6 +561,10 @@ def make_config(path: str, format: str, quality: Optional[str]) -> dict:
     ffmpeg_location = get_dependencies_path("ffmpeg")
     if ffmpeg_location:
         final_config['ffmpeg_location'] = ffmpeg_location
+
+    if use_aria2:
+        final_config["external_downloader"] = {"default": "aria2c"}
+        final_config["external_downloader_args"] = {"aria2c": ARIA2_ARGS}
    
     return final_config
 
@@ -288,7 +580,7 @@ def make_path(folder_name: str) -> str:
     """
     return os.path.join(folder_name, f".{os.path.basename(folder_name)}.json")
 
-def download_video(video_url: list[str], format: str, quality: Optional[str]) -> list[tuple[str, str, str]]:
+def download_video(video_url: list[str], format: str, quality: Optional[str], use_aria2: bool = False) -> list[PlaylistError]:
     """
     Download one or more single videos into the current directory.
 
@@ -298,16 +590,21 @@ def download_video(video_url: list[str], format: str, quality: Optional[str]) ->
     Args:
         video_url: List of YouTube video URLs to download.
         format: Desired output format (e.g., "mp3", "mp4").
+        quality: Video quality (if applicable).
+        use_aria2: Download through aria2c instead of the built-in downloader.
 
     Returns:
-        A list of errors as tuples (video_title, error_message).
+        A list of PlaylistError("Single Video", video_title, error_message).
     """
-    # Temporary folder for yt-dlp downloads to avoid partial files in target
-    temp_folder = get_temp_dir("video download")
+    # Temporary folder for yt-dlp downloads to avoid partial files in target.
+    # Each call gets its own folder, so several downloads can run at the same time
+    temp_folder = tempfile.mkdtemp(dir=get_playlist_data_dir("video download"))
     errors = []
 
-    with yt_dlp.YoutubeDL(make_config(temp_folder, format, quality)) as ydl:
+    with yt_dlp.YoutubeDL(make_config(temp_folder, format, quality, use_aria2)) as ydl:
         for url in video_url:
+            # Fall back to the URL in error reports if the title can't be fetched
+            video_title = url
             try:
                 # Try to obtain metadata first to have a readable error context
                 info = ydl.extract_info(url, download=False)
@@ -327,7 +624,7 @@ def download_video(video_url: list[str], format: str, quality: Optional[str]) ->
                 video_path = os.path.join(temp_folder, downloaded_video[0])
 
                 quality_str = ""
-                if format in ['mp4', 'mkv', 'webm']:
+                if format in VIDEO_FORMATS:
                     quality_str = get_actual_file_quality(video_path)
 
                 final_filename = f"{sanitized_title}{quality_str}.{format}"
@@ -337,7 +634,12 @@ def download_video(video_url: list[str], format: str, quality: Optional[str]) ->
 
             # Collect errors per-video without stopping the whole batch
             except Exception as e:
-                errors.append(("Single Video", video_title, str(e)))
+                errors.append(PlaylistError("Single Video", video_title, str(e)))
+
+    try:
+        shutil.rmtree(temp_folder)
+    except Exception as e:
+        errors.append(PlaylistError("Single Video", "temp cleanup failed", str(e)))
     
     return errors
 
@@ -350,13 +652,14 @@ def read_urls_from_file(file_path: str) -> tuple[list[str], list[str]]:
 
     Returns:
         tuple[list[str], list[str]]: A tuple containing two lists:
-            1. A list of valid playlist URLs found in the file.
+            1. The valid playlist URLs found in the file, in canonical form and
+               without duplicates.
             2. A list of playlist names that were skipped due to invalid URLs.
 
     Raises:
         FileNotFoundError: If the specified file does not exist.
     """
-    valid_urls = []
+    playlist_ids = []
     skipped_playlists = []
     
     # Check if the file exists before attempting to open it
@@ -385,8 +688,9 @@ def read_urls_from_file(file_path: str) -> tuple[list[str], list[str]]:
                 url = parts[1].strip()
                 
                 # Basic validation: check for standard YouTube playlist identifiers
-                if "https://" in url and "list=" in url:
-                    valid_urls.append(url)
+                match = PLAYLIST_ID_RE.search(url) if url.startswith(YOUTUBE_URL_PREFIXES) else None
+                if match:
+                    playlist_ids.append(match.group(1))
                 else:
                     # Structure is correct (Name:URL), but the URL itself is invalid.
                     # We track the name to warn the user later.
@@ -394,15 +698,18 @@ def read_urls_from_file(file_path: str) -> tuple[list[str], list[str]]:
             
             # Lines missing a colon are ignored as structural errors
 
+    # dict.fromkeys drops repeated IDs while keeping the file order
+    valid_urls = [PLAYLIST_URL_TYPE + playlist_id for playlist_id in dict.fromkeys(playlist_ids)]
+
     return valid_urls, skipped_playlists
 
-def download_playlists(playlist_url: str, folder_name: str, playlist_title: str, format: str, quality: Optional[str]) -> list[tuple[str, str, str]]:
+def download_playlists(playlist_url: str, folder_name: str, playlist_title: str, format: str, quality: Optional[str], use_aria2: bool = False, online_videos: Optional[list] = None) -> list[PlaylistError]:
     """
     Downloads an entire playlist with error recovery and state tracking.
 
     The function:
     1. Downloads each video to a temporary location
-    2. Moves successful downloads to final destination
+    2. Moves successful downloads to final destination, while the next video downloads
     3. Updates state file after each video
     4. Tracks errors without stopping the process
 
@@ -412,9 +719,12 @@ def download_playlists(playlist_url: str, folder_name: str, playlist_title: str,
         playlist_title: Title of the playlist
         format: Output format for media files
         quality: Video quality (if applicable)
+        use_aria2: Download through aria2c; the choice is saved for updates
+        online_videos: Entries already returned by fetch_online_playlist_info;
+            when given, the playlist metadata is not fetched a second time
 
     Returns:
-        list[tuple[str, str]]: List of (video_title, error_message) for failed downloads
+        list[PlaylistError]: One (playlist_title, video_title, error_message) error per failed download
 
     Notes:
         - Uses atomic operations for file moves
@@ -425,90 +735,118 @@ def download_playlists(playlist_url: str, folder_name: str, playlist_title: str,
     temp_folder = get_temp_dir(playlist_title)
 
     titles_map = {
+        "format": format,
         "quality": quality,
+        "aria2": use_aria2,
         "files": {}
     }
     errors = []
 
-    # Get playlist entries (lightweight)
-    info = basic_info(playlist_url)
+    if online_videos is None:
+        # Get playlist entries (lightweight)
+        entries = list(enumerate(basic_info(playlist_url).get('entries', [])))
+    else:
+        # Entries were already fetched by the caller: build each watch URL from the video ID
+        entries = [(video['index'] - 1, {**video, 'url': VIDEO_URL_TYPE1 + video['id']}) for video in online_videos]
+
+    def finish_entry(idx: int, entry: dict, entry_folder: str):
+        # yt-dlp output filename may vary depending on metadata; find the downloaded file
+        downloaded_files = [f for f in os.listdir(entry_folder) if f.endswith(format)] if os.path.isdir(entry_folder) else []
+        if not downloaded_files:
+            # If no file found, treat as a recoverable error for this entry
+            raise FileNotFoundError(f"{format.upper()} not found in temp folder")
+
+        original_filename_path = os.path.join(entry_folder, downloaded_files[0])
+        video_id = entry.get('id')
+        title = entry.get('title', 'Unknown')
+
+        quality_str = ""
+        if format in VIDEO_FORMATS:
+            quality_str = get_actual_file_quality(original_filename_path)
+
+        # Sanitize title for filesystem, and add numeric prefix to preserve order
+        sanitized_title = sanitize_filename(title)
+        final_title = os.path.join(folder_name, f"{idx+1} - {sanitized_title}{quality_str}.{format}")
+
+        # Move the file atomically into the destination folder
+        os.replace(original_filename_path, final_title)
+
+        # Build/update the titles map
+        video_details = {
+            "title": title,
+            "sanitized_title": sanitized_title,
+            "playlist_index": idx+1
+        }
 
-    # Iterate entries in playlist order and download one by one
-    for idx, entry in enumerate(info.get('entries', [])): 
-        with yt_dlp.YoutubeDL(make_config(temp_folder, format, quality)) as ydl:
+        titles_map["files"][video_id] = video_details
+
+        # Save an updated JSON state after each successful entry so downloads are resumable
+        save_playlist_state(playlist_title, titles_map)
+
+        # Several playlists may be downloading at once: say which one this file belongs to
+        print(f"- [{playlist_title}] {sanitized_title} downloaded.")
+
+    # Finishing an entry (quality probe, move, state save) runs on a separate worker, so the
+    # next entry starts downloading meanwhile. A single worker keeps the state writes in order
+    with ThreadPoolExecutor(max_workers=1) as finisher:
+        finishing = []
+
+        # A single YoutubeDL downloads every entry: building one loads all the extractors.
+        # Each entry gets its own temp folder (named after its ID), so its file can't be mixed up with the next download
+        with yt_dlp.YoutubeDL(make_config(temp_folder, format, quality, use_aria2, folder_per_video=True)) as ydl:
+            # Iterate entries in playlist order and download one by one
+            for idx, entry in entries:
+                entry_folder = os.path.join(temp_folder, entry.get('id') or "")
+                try:
+                    # Download the single entry into the temporary folder
+                    ydl.download([entry.get('url')])
+                    finishing.append((entry, finisher.submit(finish_entry, idx, entry, entry_folder)))
+                     
+                except Exception as e:
+                    # Record the failure for this entry, but continue with the rest
+                    errors.append(PlaylistError(playlist_title, entry.get('title', 'Unknown'), str(e)))
+                    continue
+
+        for entry, future in finishing:
             try:
-                # Download the single entry into the temporary folder
-                ydl.download([entry.get('url')])
-
-                # yt-dlp output filename may vary depending on metadata; find the downloaded file
-                downloaded_files = [f for f in os.listdir(temp_folder) if f.endswith(format)]
-                if not downloaded_files:
-                    # If no file found, treat as a recoverable error for this entry
-                    raise FileNotFoundError(f"{format.upper()} not found in temp folder")
-
-                original_filename_path = os.path.join(temp_folder, downloaded_files[0])
-                video_id = entry.get('id')
-                title = entry.get('title', 'Unknown')
-
-                quality_str = ""
-                if format in ['mp4', 'mkv', 'webm']:
-                    quality_str = get_actual_file_quality(original_filename_path)
-
-                # Sanitize title for filesystem, and add numeric prefix to preserve order
-                sanitized_title = sanitize_filename(title)
-                final_title = os.path.join(folder_name, f"{idx+1} - {sanitized_title}{quality_str}.{format}")
-
-                # Move the file atomically into the destination folder
-                os.replace(original_filename_path, final_title)
-
-                # Build/update the titles map
-                video_details = {
-                    "title": title,
-                    "sanitized_title": sanitized_title,
-                    "playlist_index": idx+1
-                }
-
-                titles_map["files"][video_id] = video_details
-
-                # Save an updated JSON state after each successful entry so downloads are resumable
-                json_filename = get_playlist_state_path(playlist_title)
-                with open(json_filename, "w", encoding="utf-8") as f:
-                    json.dump(titles_map, f, ensure_ascii=False, indent=4)
-
-                print(f"- {sanitized_title} downloaded.")
-                 
+                future.result()
             except Exception as e:
-                # Record the failure for this entry, but continue with the rest
-                errors.append((playlist_title, entry.get('title', 'Unknown'), str(e)))
-                continue
+                errors.append(PlaylistError(playlist_title, entry.get('title', 'Unknown'), str(e)))
 
     # Attempt to remove temporary folder and report errors if unable
     try:
         shutil.rmtree(temp_folder)
     except Exception as e:
-        errors.append((playlist_title, "temp cleanup failed", str(e)))
+        errors.append(PlaylistError(playlist_title, "temp cleanup failed", str(e)))
 
     return errors
 
-def fetch_online_playlist_info(playlist_url: str) -> Optional[dict]:
+def fetch_online_playlist_info(playlist_url: str, use_cache: bool = False) -> Optional[dict]:
     """
     Fetches essential playlist data from YouTube in a single call.
 
     Args:
         playlist_url: The URL of the YouTube playlist.
+        use_cache: Return the cached metadata if it was fetched less than
+            METADATA_CACHE_TTL seconds ago, and cache fresh results. Callers
+            that need up-to-date data don't read the cache, so nothing is written for them.
 
     Returns:
         A dictionary containing the playlist title and a list of its video entries
         (id, title, index), or None if fetching fails.
     """
+    if use_cache:
+        cached_info = get_cached_playlist_info(playlist_url)
+        if cached_info:
+            return cached_info
+
     try:
         # Use the lightweight yt_config to fetch only metadata
-        with yt_dlp.YoutubeDL(yt_config) as ydl:
-            info = ydl.extract_info(playlist_url, download=False)
+        info = get_metadata_ydl().extract_info(playlist_url, download=False)
 
-            # Check if yt-dlp returned valid information
-            if not info or 'entries' not in info:
-                return None
+        # Check if yt-dlp returned valid information
+        if not info or 'entries' not in info:
+            return None
 
         # Prepare the data structure to be returned
         playlist_title = info.get('title', 'Unknown Playlist')
@@ -527,10 +865,18 @@ def fetch_online_playlist_info(playlist_url: str) -> Optional[dict]:
             }
             online_videos.append(video_info)
 
-        return {
+        playlist_info = {
             'title': playlist_title,
             'videos': online_videos
         }
+        if use_cache:
+            try:
+                cache_playlist_info(playlist_url, playlist_info)
+            except OSError:
+                # The cache is only an optimization: the fetched data is still good
+                pass
+
+        return playlist_info
 
     except:
         # Catch any exception from yt-dlp (e.g., network error, invalid URL)
@@ -551,20 +897,22 @@ def detect_format(folder_name: str) -> Optional[str]:
         - Returns the format of the first valid file found
         - Returns None if folder is empty or contains no media files
     """
-    # A list of common media extensions to look for.
+    # The common media extensions to look for.
     # This avoids picking up other files like .txt, .json, .jpg etc.
-    supported_formats = {"mp3", "m4a", "flac", "opus", "wav", "mp4", "mkv", "webm"}
+    supported_formats = AUDIO_FORMATS | VIDEO_FORMATS
 
     try:
-        for filename in os.listdir(folder_name):
-            # Check if it's a file and not a directory
-            if os.path.isfile(os.path.join(folder_name, filename)):
-                # Extract the extension, remove the dot, and convert to lowercase
-                extension = os.path.splitext(filename)[1].replace('.', '').lower()
-                
-                # If the extension is one of our supported media formats, we found it.
-                if extension in supported_formats:
-                    return extension
+        # scandir entries carry the file type, so no extra stat call is needed per file
+        with os.scandir(folder_name) as entries:
+            for entry in entries:
+                # Check if it's a file and not a directory
+                if entry.is_file():
+                    # Extract the extension, remove the dot, and convert to lowercase
+                    extension = os.path.splitext(entry.name)[1].replace('.', '').lower()
+
+                    # If the extension is one of our supported media formats, we found it.
+                    if extension in supported_formats:
+                        return extension
     except FileNotFoundError:
         # The folder might not exist, which is a possible scenario
         return None
@@ -572,7 +920,35 @@ def detect_format(folder_name: str) -> Optional[str]:
     # If the loop finishes without finding any suitable file
     return None
 
-def cleanup_deleted_videos(online_videos: list, playlist_title: str, folder_name: str) -> list[tuple[str, str, str]]:
+def get_playlist_format(playlist_title: str, folder_name: str) -> Optional[str]:
+    """
+    Returns the media format of a downloaded playlist.
+
+    The format is read from the playlist state file when known (it is saved by
+    download_playlists). Otherwise, for playlists downloaded before the format
+    was saved, the folder is scanned with detect_format and the result is stored in the state
+    file, so later updates don't need to scan the folder again.
+
+    Args:
+        playlist_title: The title of the playlist.
+        folder_name: The path to the local media folder.
+
+    Returns:
+        str: File extension (e.g. "mp3", "m4a") or None if no media files found.
+    """
+    state = load_playlist_state(playlist_title)
+    if state.get("format"):
+        return state["format"]
+
+    file_format = detect_format(folder_name)
+    # Only persist into an existing state: an empty one would lack the "files" map
+    if file_format and state:
+        state["format"] = file_format
+        save_playlist_state(playlist_title, state)
+
+    return file_format
+
+def cleanup_deleted_videos(online_videos: list, playlist_title: str, folder_name: str) -> list[PlaylistError]:
     """
     Compares local state with online and removes obsolete files.
 
@@ -585,12 +961,9 @@ def cleanup_deleted_videos(online_videos: list, playlist_title: str, folder_name
         A list of non-critical errors encountered during the cleanup process.
     """
     errors = []
-    state_path = get_playlist_state_path(playlist_title)
 
-    try:
-        with open(state_path, "r", encoding="utf-8") as f:
-            local_data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+    local_data = load_playlist_state(playlist_title)
+    if not local_data:
         # No state file, nothing to clean up.
         return errors
 
@@ -603,8 +976,8 @@ def cleanup_deleted_videos(online_videos: list, playlist_title: str, folder_name
     if not videos_to_delete_ids:
         return errors
 
-    # Detect media format from existing files
-    file_format = detect_format(folder_name)
+    # Use the stored media format, falling back to detecting it from existing files
+    file_format = local_data.get("format") or detect_format(folder_name)
     if not file_format:
         return errors
 
@@ -625,17 +998,16 @@ def cleanup_deleted_videos(online_videos: list, playlist_title: str, folder_name
 
             del local_data["files"][video_id]
 
-            with open(state_path, "w", encoding="utf-8") as f:
-                json.dump(local_data, f, ensure_ascii=False, indent=4)
+            save_playlist_state(playlist_title, local_data)
 
         except OSError as e:
             # We add the error to our list and continue with the next file.
-            errors.append((playlist_title, "Deletion Error", f"Could not delete file {filename_to_delete}: {e}"))
+            errors.append(PlaylistError(playlist_title, "Deletion Error", f"Could not delete file {filename_to_delete}: {e}"))
             continue
             
     return errors
 
-def reorder_local_videos(online_videos: list, playlist_title: str, folder_name: str) -> list[tuple[str, str, str]]:
+def reorder_local_videos(online_videos: list, playlist_title: str, folder_name: str) -> list[PlaylistError]:
     """
     Reorders local files to match the current online playlist order.
 
@@ -652,14 +1024,11 @@ def reorder_local_videos(online_videos: list, playlist_title: str, folder_name:
         A list of non-critical errors encountered during the reordering process.
     """
     errors = []
-    state_path = get_playlist_state_path(playlist_title)
 
     # --- Step 1: Backup and State Loading ---
     backup_path = None
-    try:
-        with open(state_path, "r", encoding="utf-8") as f:
-            local_data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+    local_data = load_playlist_state(playlist_title)
+    if not local_data:
         # No state file, nothing to reorder.
         return errors
 
@@ -689,12 +1058,12 @@ def reorder_local_videos(online_videos: list, playlist_title: str, folder_name:
         # Create backup ONLY if there are files to rename
         backup_path, backup_error = folder_backup(folder_name, playlist_title)
         if backup_error:
-            errors.append((playlist_title, "Backup Error", backup_error))
+            errors.append(PlaylistError(playlist_title, "Backup Error", backup_error))
             return errors
 
-        file_format = detect_format(folder_name)
+        file_format = local_data.get("format") or detect_format(folder_name)
         if not file_format:
-            errors.append((playlist_title, "Reorder Warning", "Could not detect media format. Skipping reorder."))
+            errors.append(PlaylistError(playlist_title, "Reorder Warning", "Could not detect media format. Skipping reorder."))
             return errors
 
         for file in files_to_rename:
@@ -708,22 +1077,21 @@ def reorder_local_videos(online_videos: list, playlist_title: str, folder_name:
                 # Update the index in our local data
                 local_data["files"][file['id']]['playlist_index'] = file['new_index']
                 # Atomically save the state file
-                with open(state_path, "w", encoding="utf-8") as f:
-                    json.dump(local_data, f, ensure_ascii=False, indent=4)
+                save_playlist_state(playlist_title, local_data)
             else:
-                errors.append((playlist_title, "File Not Found", f"Could not find file to rename: {old_filename}"))
+                errors.append(PlaylistError(playlist_title, "File Not Found", f"Could not find file to rename: {old_filename}"))
 
     except Exception as e:
         # --- Step 3: Rollback on Critical Failure ---
-        errors.append((playlist_title, "CRITICAL REORDER FAILED", f"An error occurred: {e}. Attempting to restore from backup."))
+        errors.append(PlaylistError(playlist_title, "CRITICAL REORDER FAILED", f"An error occurred: {e}. Attempting to restore from backup."))
         if backup_path and os.path.isdir(backup_path):
             try:
                 # Simple restore: remove the broken folder and replace it with the backup
                 shutil.rmtree(folder_name)
                 shutil.copytree(backup_path, folder_name)
-                errors.append((playlist_title, "Restore Success", "Successfully restored folder from backup."))
+                errors.append(PlaylistError(playlist_title, "Restore Success", "Successfully restored folder from backup."))
             except Exception as restore_e:
-                errors.append((playlist_title, "CRITICAL RESTORE FAILED", f"Could not restore from backup: {restore_e}"))
+                errors.append(PlaylistError(playlist_title, "CRITICAL RESTORE FAILED", f"Could not restore from backup: {restore_e}"))
         raise  # Re-raise the exception to stop the update process in main
 
     finally:
@@ -733,11 +1101,11 @@ def reorder_local_videos(online_videos: list, playlist_title: str, folder_name:
             try:
                 shutil.rmtree(backup_path)
             except Exception as clean_e:
-                errors.append((playlist_title, "Backup Cleanup Failed", str(clean_e)))
+                errors.append(PlaylistError(playlist_title, "Backup Cleanup Failed", str(clean_e)))
 
     return errors
 
-def download_new_videos(online_videos: list, playlist_title: str, folder_name: str, format: str) -> list[tuple[str, str, str]]:
+def download_new_videos(online_videos: list, playlist_title: str, folder_name: str, format: str, max_parallel: int = 1) -> list[PlaylistError]:
     """
     Downloads new videos that are in the online playlist but not locally.
 
@@ -751,20 +1119,17 @@ def download_new_videos(online_videos: list, playlist_title: str, folder_name: s
         playlist_title: The title of the playlist.
         folder_name: The path to the local media folder.
         file_format: The desired output format (e.g., "mp3").
+        max_parallel: How many videos are downloaded at the same time.
 
     Returns:
         A list of non-critical errors encountered during the download process.
     """
     errors = []
-    state_path = get_playlist_state_path(playlist_title)
 
     # Step 1: Load local state
-    try:
-        with open(state_path, "r", encoding="utf-8") as f:
-            local_data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        # If the state file doesn't exist, we start with an empty dictionary.
-        local_data = {}
+    # If the state file doesn't exist, we start with an empty dictionary.
+    local_data = load_playlist_state(playlist_title)
+    local_data.setdefault("files", {})
 
     # Step 2: Identify missing videos
     local_ids = set(local_data.get("files", {}).keys())
@@ -775,59 +1140,86 @@ def download_new_videos(online_videos: list, playlist_title: str, folder_name: s
 
     # Step 3: Set up for download
     quality = local_data.get("quality", None)
+    # aria2c may have been uninstalled since the playlist was first downloaded
+    use_aria2 = local_data.get("aria2", False) and is_aria2_available()
 
     temp_folder = get_temp_dir(playlist_title)
-    ydl_opts = make_config(temp_folder, format, quality)
-    
-    # Step 4: Perform atomic download operations
-    for video in new_videos:
-        video_url = VIDEO_URL_TYPE1 + video['id']
-        video_title = video['title']
-        
-        try:
-            # a. Download the video to the temp folder
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_url])
 
-            # Find the downloaded file in the temp folder
-            downloaded_files = [f for f in os.listdir(temp_folder) if f.endswith(format)]
-            if not downloaded_files:
-                raise FileNotFoundError(f"Downloaded file with format .{format} not found in temp folder.")
+    def finish_video(video: dict, video_folder: str):
+        # Find the downloaded file in the video's temp folder
+        downloaded_files = [f for f in os.listdir(video_folder) if f.endswith(format)] if os.path.isdir(video_folder) else []
+        if not downloaded_files:
+            raise FileNotFoundError(f"Downloaded file with format .{format} not found in temp folder.")
 
-            original_filename_path = os.path.join(temp_folder, downloaded_files[0])
-            
-            # b. Move the file to the final destination
-            sanitized_title = sanitize_filename(video_title)
-            final_filename = f"{video['index']} - {sanitized_title}.{format}"
-            final_file_path = os.path.join(folder_name, final_filename)
-            
-            shutil.move(original_filename_path, final_file_path)
+        original_filename_path = os.path.join(video_folder, downloaded_files[0])
 
-            # c. Add the new video to our local data
-            local_data["files"][video['id']] = {
-                "title": video_title,
-                "sanitized_title": sanitized_title,
-                "playlist_index": video['index']
-            }
+        # b. Move the file to the final destination
+        sanitized_title = sanitize_filename(video['title'])
+        final_filename = f"{video['index']} - {sanitized_title}.{format}"
+        final_file_path = os.path.join(folder_name, final_filename)
 
-            # d. Save the updated state file
-            with open(state_path, "w", encoding="utf-8") as f:
-                json.dump(local_data, f, ensure_ascii=False, indent=4)
+        shutil.move(original_filename_path, final_file_path)
 
-            print(f"- {sanitized_title} downloaded")
+        # c. Add the new video to our local data
+        local_data["files"][video['id']] = {
+            "title": video['title'],
+            "sanitized_title": sanitized_title,
+            "playlist_index": video['index']
+        }
 
-        except Exception as e:
-            errors.append((playlist_title, "Download Error", f"Failed to download '{video_title}': {e}"))
-            # Clean up the temp folder to avoid issues with the next video
-            for f in os.listdir(temp_folder):
-                os.remove(os.path.join(temp_folder, f))
-            continue
+        # d. Save the updated state file
+        save_playlist_state(playlist_title, local_data)
+
+        print(f"- {sanitized_title} downloaded")
+
+    # Step 4: Perform atomic download operations
+    # As in download_playlists, moving a file and saving the state run on a single
+    # separate worker, so the state writes never overlap
+    pending_videos = queue.SimpleQueue()
+    for video in new_videos:
+        pending_videos.put(video)
+
+    def download_worker():
+        # Each worker has its own YoutubeDL (instances are not meant to be shared between
+        # threads) and takes the next pending video until none are left.
+        # Each video gets its own temp folder (named after its ID), so files can't be mixed up
+        with yt_dlp.YoutubeDL(make_config(temp_folder, format, quality, use_aria2, folder_per_video=True)) as ydl:
+            while True:
+                try:
+                    video = pending_videos.get_nowait()
+                except queue.Empty:
+                    return
+
+                video_url = VIDEO_URL_TYPE1 + video['id']
+                video_folder = os.path.join(temp_folder, video['id'])
+
+                try:
+                    # a. Download the video to the temp folder
+                    ydl.download([video_url])
+                    finishing.append((video, finisher.submit(finish_video, video, video_folder)))
+
+                except Exception as e:
+                    errors.append(PlaylistError(playlist_title, "Download Error", f"Failed to download '{video['title']}': {e}"))
+
+    with ThreadPoolExecutor(max_workers=1) as finisher:
+        finishing = []
+
+        workers_count = max(1, min(max_parallel, len(new_videos)))
+        with ThreadPoolExecutor(max_workers=workers_count) as downloaders:
+            for worker in [downloaders.submit(download_worker) for _ in range(workers_count)]:
+                worker.result()
+
+        for video, future in finishing:
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(PlaylistError(playlist_title, "Download Error", f"Failed to download '{video['title']}': {e}"))
 
     # Step 5: Final cleanup
     try:
         shutil.rmtree(temp_folder)
     except Exception as e:
-        errors.append((playlist_title, "Temp Cleanup Failed", str(e)))
+        errors.append(PlaylistError(playlist_title, "Temp Cleanup Failed", str(e)))
 
     return errors
 
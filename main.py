@@ -14,19 +14,190 @@ The script maintains a hidden JSON file in each playlist folder to track video o
 and playlist state.
 """
 
-import os, shutil
-import yt_dlp
+import os, re, sys, shutil, atexit, argparse
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from typing import Optional, Callable
 from pathvalidate import sanitize_filename
-from time import sleep
 import core
-from core import yt_config
-from core import PLAYLIST_URL_TYPE, VIDEO_URL_TYPE1, VIDEO_URL_TYPE2
-
-# Constants for common text pairs used in the UI
-utility_words = [("download", "Download"), ("update", "Update")]
+from core import PLAYLIST_URL_TYPE, VIDEO_URL_TYPE1, YOUTUBE_URL_PREFIXES, PLAYLIST_ID_RE, AUDIO_FORMATS, PlaylistError
+
+try:
+    import readline
+except ImportError:
+    # Line editing is a convenience: input() keeps working without it
+    readline = None
+
+# Constants for common text pairs used in the UI: (key word to type, label to display)
+# for each playlist menu choice
+KEYWORD_BY_CHOICE = {"1": ("download", "Download"), "2": ("update", "Update")}
+
+BANNER = "### --- YOUTUBE MANAGER --- ###"
+# Last centered banner and the terminal width it was centered for
+_banner_width: Optional[int] = None
+_centered_banner = ""
+
+# Matches every URL in a pasted block of text
+_URL_RE = re.compile(r'https?://[^\s]+')
+
+# Video ID, extracted with a single regex search (see core.PLAYLIST_ID_RE for playlists)
+_VIDEO_RE = re.compile(r'(?:[?&]v=|youtu\.be/)([A-Za-z0-9_-]{11})')
+
+# URL normalization rules as (predicate, normalizer) pairs, tried in order.
+# Each normalizer extracts the ID and rebuilds a clean URL, so that the many
+# possible YouTube URL formats map to a single canonical form.
+# A normalizer returning None means the URL has no usable ID.
+PLAYLIST_RULES = (
+    (lambda url: url.startswith(YOUTUBE_URL_PREFIXES),
+     lambda url: PLAYLIST_URL_TYPE + match.group(1) if (match := PLAYLIST_ID_RE.search(url)) else None),
+)
+VIDEO_RULES = (
+    # Playlist links are excluded to avoid interpreting them as single-video downloads.
+    # Shortened youtu.be links map to the canonical watch?v= link too (tracking parameters are dropped)
+    (lambda url: url.startswith(YOUTUBE_URL_PREFIXES) and not PLAYLIST_ID_RE.search(url),
+     lambda url: VIDEO_URL_TYPE1 + match.group(1) if (match := _VIDEO_RE.search(url)) else None),
+)
+
+# Number of inputs kept in the history file across sessions
+HISTORY_LENGTH = 500
+
+# Default maximum number of playlists (or single videos) downloaded at the same time,
+# see --max-parallel. Kept small to avoid being rate-limited by YouTube
+MAX_PARALLEL_DOWNLOADS = 4
+
+# Playlist metadata is fetched in background as soon as a URL is accepted,
+# overlapping the network round trips with the time spent typing the next URLs.
+# Metadata requests are light, so more of them run at once than downloads
+PREFETCH_WORKERS = 8
+prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+prefetched_info: dict[str, Future] = {}
 
 def clear_screen():
-    os.system("cls") if os.name == "nt" else os.system("clear")    
+    # Clear screen and scrollback, then move the cursor home, like `clear` does but without spawning a shell
+    sys.stdout.write("\x1b[2J\x1b[3J\x1b[H")
+    sys.stdout.flush()
+
+def get_banner() -> str:
+    """
+    Returns the banner centered on the terminal width.
+    The banner is centered again only when the width has changed since the last call.
+    """
+    global _banner_width, _centered_banner
+    columns = shutil.get_terminal_size().columns
+    if columns != _banner_width:
+        _banner_width = columns
+        _centered_banner = BANNER.center(columns)
+    return _centered_banner
+
+def prefetch_playlist_info(url: str, use_cache: bool = False):
+    """
+    Starts fetching the metadata of a playlist in background.
+    """
+    if url not in prefetched_info:
+        prefetched_info[url] = prefetch_pool.submit(core.fetch_online_playlist_info, url, use_cache)
+
+def get_playlist_info(url: str, use_cache: bool = False) -> Optional[dict]:
+    """
+    Returns the metadata of a playlist (see core.fetch_online_playlist_info),
+    waiting for the background fetch if one was started.
+    """
+    future = prefetched_info.pop(url, None)
+    if future is None:
+        return core.fetch_online_playlist_info(url, use_cache)
+    return future.result()
+
+def get_cached_folder(url: str) -> Optional[str]:
+    """
+    Returns the folder name of a playlist already seen by the application,
+    using only the local cache, or None if the playlist is unknown.
+    """
+    cached_title = core.get_cached_playlist_title(url)
+    return sanitize_filename(cached_title) if cached_title else None
+
+def list_existing_folders() -> set[str]:
+    """
+    Returns the names of the folders in the current directory, read with a single
+    directory scan instead of one os.path.isdir call per playlist.
+    """
+    with os.scandir(".") as entries:
+        return {entry.name for entry in entries if entry.is_dir()}
+
+def folder_exists(folder_name: str, existing_folders: Optional[set[str]] = None) -> bool:
+    """
+    Tells whether a folder exists, using the result of list_existing_folders when given.
+    """
+    if existing_folders is None:
+        return os.path.isdir(folder_name)
+    return folder_name in existing_folders
+
+def is_already_downloaded(url: str, existing_folders: Optional[set[str]] = None) -> bool:
+    """
+    Tells whether a playlist already seen by the application has its folder
+    in the current directory, using only the local cache.
+    """
+    cached_folder = get_cached_folder(url)
+    return cached_folder is not None and folder_exists(cached_folder, existing_folders)
+
+def is_known_but_missing(url: str, existing_folders: Optional[set[str]] = None) -> bool:
+    """
+    Tells whether a playlist already seen by the application has no folder
+    in the current directory, using only the local cache.
+    """
+    cached_folder = get_cached_folder(url)
+    return cached_folder is not None and not folder_exists(cached_folder, existing_folders)
+
+def setup_input_history():
+    """
+    Loads the input history of previous sessions and saves it again on exit,
+    so URLs typed before can be recalled with the arrow keys.
+    """
+    if readline is None:
+        return
+
+    history_path = os.path.join(core.get_app_data_dir(), "input_history")
+    readline.set_history_length(HISTORY_LENGTH)
+    try:
+        readline.read_history_file(history_path)
+    except OSError:
+        pass
+
+    def save_history():
+        try:
+            readline.write_history_file(history_path)
+        except OSError:
+            # The data directory may have been deleted from the menu
+            pass
+
+    atexit.register(save_history)
+
+def enable_url_completion(urls: list[str]):
+    """
+    Enables tab completion over the given list of URLs for the following inputs.
+    The list is read at completion time, so URLs added later are completed too.
+    """
+    if readline is None:
+        return
+
+    def completer(text: str, state: int):
+        matches = [url for url in urls if url.startswith(text)]
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(completer)
+    # Complete whole URLs instead of stopping at "/", ":", "?" or "="
+    readline.set_completer_delims(" \t\n")
+    readline.parse_and_bind("tab: complete")
+
+def print_lines(lines: list[str]):
+    """
+    Prints several lines with a single write to the terminal.
+    """
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def print_errors(errors: list[PlaylistError]):
+    """
+    Prints the collected errors, one per line, with a single write to the terminal.
+    """
+    print_lines([f" - [{error.source}] {error.kind}: {error.message}" for error in errors])
 
 def ask_for_format() -> str:
     """
@@ -54,15 +225,17 @@ def ask_for_format() -> str:
     }
   
     while True:
-        print("\nChose a format for the download:")
-        print("1: mp3  (Audio, max compatibility)")
-        print("2: m4a  (Audio, modern & efficient)")
-        print("3: flac (Audio, lossless - large files)")
-        print("4: opus (Audio, ideal for speech - small files)")
-        print("5: wav  (Audio, uncompressed - for editing)")
-        print("6: mp4  (Video + Audio, max compatibility)")
-        print("7: mkv  (Video + Audio, flexible format)")
-        print("8: webm (Video + Audio, modern web format)")
+        print_lines([
+            "\nChose a format for the download:",
+            "1: mp3  (Audio, max compatibility)",
+            "2: m4a  (Audio, modern & efficient)",
+            "3: flac (Audio, lossless - large files)",
+            "4: opus (Audio, ideal for speech - small files)",
+            "5: wav  (Audio, uncompressed - for editing)",
+            "6: mp4  (Video + Audio, max compatibility)",
+            "7: mkv  (Video + Audio, flexible format)",
+            "8: webm (Video + Audio, modern web format)"
+        ])
         
         chosen_format = input("\nFormat: ").strip()
 
@@ -98,15 +271,17 @@ def ask_for_video_quality() -> str:
     }
     
     while True:
-        print("\nChoose a maximum video resolution for the download:")
-        print("Note: If a video is not available in the chosen quality,")
-        print("the next best available quality will be downloaded.")
-        print("1: 4K (2160p)")
-        print("2: 2K (1440p)")
-        print("3: Full HD (1080p)")
-        print("4: HD (720p)")
-        print("5: Standard (480p)")
-        print("6: Low (360p)")
+        print_lines([
+            "\nChoose a maximum video resolution for the download:",
+            "Note: If a video is not available in the chosen quality,",
+            "the next best available quality will be downloaded.",
+            "1: 4K (2160p)",
+            "2: 2K (1440p)",
+            "3: Full HD (1080p)",
+            "4: HD (720p)",
+            "5: Standard (480p)",
+            "6: Low (360p)"
+        ])
         
         choice = input("\nResolution: ").strip()
         
@@ -117,57 +292,103 @@ def ask_for_video_quality() -> str:
             print(f"\nInvalid choice. Please select a number from 1 to {len(quality_options)}. Press 'Enter' to continue...")
             input()
             clear_screen()
+
+def ask_for_aria2() -> bool:
+    """
+    Asks whether downloads should go through aria2c.
+
+    Returns:
+        bool: True if aria2c is installed and the user accepted it
+
+    Notes:
+        - aria2c opens several connections per file, which is usually much
+          faster when YouTube throttles each connection
+        - The prompt is skipped when aria2c is not installed
+        - Pressing 'Enter' accepts the default (yes)
+    """
+    if not core.is_aria2_available():
+        return False
+
+    while True:
+        choice = input("Use aria2c for faster downloads? [Y/n]: ").strip().lower()
+
+        if choice in ("", "y", "yes"):
+            clear_screen()
+            return True
+        if choice in ("n", "no"):
+            clear_screen()
+            return False
+        print("Invalid choice. Please answer 'y' or 'n'.")
         
     
 
-def playlists_urls_aquisition(user_choice: str) -> list[str]:
+def urls_aquisition(prompt: str, key_word: str, rules: tuple, on_new_url: Optional[Callable[[str], None]] = None, file_import: bool = False) -> list[str]:
     """
-    Collects and validates YouTube playlist URLs from user input.
+    Collects and validates YouTube URLs from user input.
 
     Args:
-        user_choice: Main menu selection ("1" for download, "2" for update)
+        prompt: Instructions shown above the list of collected URLs
+        key_word: Input that ends the collection (e.g. "download")
+        rules: (predicate, normalizer) pairs; the first matching predicate selects
+               the normalizer that turns the input into a canonical URL
+        on_new_url: Optional callback invoked for every newly added URL
+        file_import: Whether "url.txt" can be entered to import playlist URLs from file
 
     Returns:
-        list[str]: List of normalized YouTube playlist URLs
+        list[str]: List of normalized YouTube URLs
 
     Notes:
         - Standardizes URLs to a canonical format
         - Prevents duplicate entries
-        - Continues collecting until user enters "download" or "update"
-        - Validates URL format and presence of playlist ID
+        - Continues collecting until user enters the key word
+        - Accepts several URLs pasted at once in a single input
     """
-    def check_url(user_input: str):
-        if user_input not in playlists_urls:
-            playlists_urls.append(user_input)
-        else:
+    def normalize(user_input: str) -> Optional[str]:
+        # The first matching rule decides: its normalizer may still reject the URL by returning None
+        return next((normalizer(user_input) for matches, normalizer in rules if matches(user_input)), None)
+
+    def check_url(user_input: str, quiet: bool = False):
+        if user_input not in seen_urls:
+            seen_urls.add(user_input)
+            urls.append(user_input)
+            if on_new_url:
+                on_new_url(user_input)
+        elif not quiet:
             print("\nThis URL has already been added. Press Enter to continue...")
             input()
-        clear_screen()
-
-    playlists_urls = []
+        if not quiet:
+            clear_screen()
 
-    key_word = utility_words[0 if user_choice == "1" else 1][0]
+    # The list keeps the display order, the set makes the duplicate check O(1)
+    urls: list[str] = []
+    seen_urls: set[str] = set()
+    enable_url_completion(urls)
 
     while True:
-        columns = shutil.get_terminal_size().columns
-        print("\n" + "### --- YOUTUBE MANAGER --- ###".center(columns) + "\n")
-        print(f"Insert your playlist URLs: (Insert '{key_word}' to start the {key_word})\n")
-
-        if len(playlists_urls):
-            for j, url in enumerate(playlists_urls):
-                print(f"URL {j+1}: {url}")
+        print_lines(["\n" + get_banner() + "\n", f"{prompt}\n"] + [f"URL {j+1}: {url}" for j, url in enumerate(urls)])
 
         user_input = input(f"Input: ").strip()
-        if user_input.lower() == utility_words[0][0] and user_choice == "1" or user_input.lower() == utility_words[1][0] and user_choice == "2":
+        found_urls = _URL_RE.findall(user_input)
+        if user_input.lower() == key_word:
+            clear_screen()
+            return urls
+
+        # Several URLs pasted at once: add them all in a single pass, duplicates are skipped silently
+        elif len(found_urls) > 1:
+            skipped = 0
+            for found_url in found_urls:
+                clean_url = normalize(found_url)
+                if clean_url:
+                    check_url(clean_url, quiet=True)
+                else:
+                    skipped += 1
+
+            if skipped:
+                print(f"\n{skipped} of the pasted URLs are not valid and were skipped. Press Enter to continue...")
+                input()
             clear_screen()
-            return playlists_urls
-        
-        # Extracts the playlist ID and rebuilds a clean URL to standardize it.
-        # This normalizes many possible YouTube playlist url formats to a single canonical form.
-        elif "https://" in user_input and "list=" in user_input:
-            check_url(PLAYLIST_URL_TYPE + user_input.split("list=")[-1].split("&")[0])
 
-        elif user_input == "url.txt":
+        elif file_import and user_input == "url.txt":
             try:
                 valid_urls, skipped_names = core.read_urls_from_file(user_input)
                 
@@ -178,21 +399,14 @@ def playlists_urls_aquisition(user_choice: str) -> list[str]:
                     clear_screen()
                     continue
 
-                print(f"\nImporting from {user_input}...")
-                sleep(1)
+                # URLs come back already canonical; those entered before are skipped silently,
+                # and the list is shown once at the end
+                for playlist_url in valid_urls:
+                    check_url(playlist_url, quiet=True)
 
-                for raw_url in valid_urls:
-                    clean_link = PLAYLIST_URL_TYPE + raw_url.split("list=")[-1].split("&")[0]
-                    
-                    check_url(clean_link)
+                clear_screen()
+                print_lines(["\n" + get_banner() + "\n", f"Imported from {user_input}:\n"] + [f"URL {j+1}: {url}" for j, url in enumerate(urls)])
 
-                    print("\n" + "### --- YOUTUBE MANAGER --- ###".center(columns) + "\n")
-                    print(f"Importing from {user_input}...\n")
-                    for j, url in enumerate(playlists_urls):
-                        print(f"URL {j+1}: {url}")
-                    
-                    sleep(1)
-                
                 if skipped_names:
                     print("\nWARNING: Some playlists were skipped due to invalid URLs:")
                     for name in skipped_names:
@@ -207,77 +421,122 @@ def playlists_urls_aquisition(user_choice: str) -> list[str]:
                 print("Press Enter to continue...")
                 input()
                 clear_screen()
+
         else:
-            print("\nInvalid input. Press Enter to continue...")
-            input()
-            clear_screen()
+            clean_url = normalize(user_input)
+            if clean_url:
+                check_url(clean_url)
+            else:
+                print("\nInvalid input. Press Enter to continue...")
+                input()
+                clear_screen()
 
-def videos_urls_aquisition() -> list[str]:
+def playlists_urls_aquisition(user_choice: str) -> list[str]:
     """
-    Collects and validates YouTube single video URLs from user input.
+    Collects YouTube playlist URLs, see urls_aquisition.
 
-    Returns:
-        list[str]: List of normalized YouTube video URLs
+    Args:
+        user_choice: Main menu selection ("1" for download, "2" for update)
+    """
+    def on_new_url(url: str):
+        # Playlists that the cache already says will be skipped don't need their metadata
+        will_be_skipped = is_already_downloaded(url) if user_choice == "1" else is_known_but_missing(url)
+        if not will_be_skipped:
+            # A new download can reuse recent metadata; an Update must see the playlist as it is now
+            prefetch_playlist_info(url, use_cache=user_choice == "1")
 
-    Notes:
-        - Accepts both standard watch?v= URLs and shortened youtu.be links
-        - Converts all URLs to canonical watch?v= format
-        - Prevents duplicate entries
-        - Continues collecting until user enters "download"
-        - Excludes playlist URLs to avoid confusion
+    key_word = KEYWORD_BY_CHOICE[user_choice][0]
+    prompt = f"Insert your playlist URLs: (Insert '{key_word}' to start the {key_word})"
+    return urls_aquisition(prompt, key_word, PLAYLIST_RULES, on_new_url, file_import=True)
+
+def videos_urls_aquisition() -> list[str]:
     """
-    def check_url(user_input: str):
-        if user_input not in videos_url:
-            videos_url.append(user_input)
-        else:
-            print("\nThis URL has already been added. Press Enter to continue...")
-            input()
-        clear_screen()
+    Collects YouTube single video URLs, see urls_aquisition.
+    """
+    return urls_aquisition("Insert your videos URLs: (Insert 'download' to start the download)", "download", VIDEO_RULES)
 
-    videos_url = []
+def download_one_playlist(url: str, chosen_format: str, chosen_quality: Optional[str], use_aria2: bool, existing_folders: Optional[set[str]] = None) -> tuple[Optional[str], list[PlaylistError]]:
+    """
+    Downloads a single playlist into a new folder named after its title.
 
-    while True:
-        columns = shutil.get_terminal_size().columns
-        print("\n" + "### --- YOUTUBE MANAGER --- ###".center(columns) + "\n")
-        print("Insert your videos URLs: (Insert 'download' to start the download)\n")
+    Runs on the download pool, so several playlists are handled at the same time.
 
-        if len(videos_url):
-            for j, url in enumerate(videos_url):
-                print(f"URL {j+1}: {url}")
+    Args:
+        url: Playlist URL
+        chosen_format: Output format for media files
+        chosen_quality: Video quality (if applicable)
+        use_aria2: Download through aria2c
+        existing_folders: Folders of the current directory, see list_existing_folders
 
-        user_input = input(f"Input: ").strip()
-        if user_input.lower() == "download":
-            clear_screen()
-            return videos_url
-    
-        # Extracts the video ID and rebuilds a clean URL to standardize it.
-        # Note: the check avoids interpreting playlist links as single-video downloads.
-        elif "https://" in user_input and "watch?v=" in user_input and "list=" not in user_choice:
-            check_url(VIDEO_URL_TYPE1 + user_input.split("watch?v=")[-1].split("&")[0])
-        elif user_input.startswith(VIDEO_URL_TYPE2):
-            # Shortened youtu.be link -> convert to canonical watch?v= link
-            check_url(VIDEO_URL_TYPE1 + user_input.split(".be/")[-1]) 
-        else:
-            print("\nInvalid input. Press Enter to continue...")
-            input()
-            clear_screen()
+    Returns:
+        tuple: The folder name if the playlist was skipped because its folder
+        already exists (None otherwise), and the list of errors
+
+    Notes:
+        - The folder is created with a single os.makedirs call, so two playlists
+          with the same title can't both download into it
+    """
+    # A playlist already seen whose folder exists only needs an Update:
+    # skip it straight away, without querying YouTube
+    if is_already_downloaded(url, existing_folders):
+        return sanitize_filename(core.get_cached_playlist_title(url)), []
+
+    # Playlist metadata (title and entries) was prefetched while the URLs were being entered
+    info = get_playlist_info(url, use_cache=True)
+    if not info:
+        return None, [PlaylistError(url, "Info Error", "Could not fetch playlist information")]
+
+    playlist_title = info['title']
+    folder_name = sanitize_filename(playlist_title)
+    core.cache_playlist_title(url, playlist_title)
+
+    # If the folder already exists, suggest to use Update to avoid duplication
+    try:
+        os.makedirs(folder_name)
+    except FileExistsError:
+        return folder_name, []
+
+    try:
+        # Delegate the resilient per-entry download to core.download_playlists
+        return None, core.download_playlists(url, folder_name, playlist_title, chosen_format, chosen_quality, use_aria2, info['videos'])
+    except Exception as e:
+        return None, [PlaylistError(playlist_title, "DOWNLOAD FAILED", f"A critical error occurred: {e}")]
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line options.
+    """
+    parser = argparse.ArgumentParser(description="Download and keep YouTube playlists up to date.")
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=MAX_PARALLEL_DOWNLOADS,
+        help=f"maximum number of playlists or videos downloaded at the same time (default: {MAX_PARALLEL_DOWNLOADS})"
+    )
+    args = parser.parse_args()
+
+    if args.max_parallel < 1:
+        parser.error("--max-parallel must be at least 1")
+
+    return args
         
 
 # Main program loop with state machine architecture
 if __name__ == "__main__":
+    max_parallel = parse_args().max_parallel
     current_state = "main_menu"
+    setup_input_history()
     clear_screen()
 
     while True:
     # State machine implementation for navigation between different menus
     # States: main_menu, playlist_menu, videos_download, delete_data, exit
-        columns = shutil.get_terminal_size().columns
 
         # --- MAIN MENU STATE ---
         if current_state == "main_menu":
             clear_screen()
-            print("### --- YOUTUBE MANAGER --- ###".center(columns) + "\n")
-            print("1 - Manage Playlists\n2 - Download Videos\n3 - Delete Application Data\n4 - Exit")
+            print(get_banner() + "\n")
+            print("1 - Manage Playlists\n2 - Download Videos\n3 - Delete Application Data\n4 - Clear Metadata Cache\n5 - Exit")
             user_choice = input("Select an option: ")
 
             if user_choice == "1":
@@ -287,9 +546,14 @@ if __name__ == "__main__":
             elif user_choice == "3":
                 current_state = "delete_data"
             elif user_choice == "4":
+                # Playlist metadata is reused for a few hours: this forces the next downloads to ask YouTube
+                success, message = core.clear_metadata_cache()
+                print(f"\n{message}\nPress 'Enter' to continue...")
+                input()
+            elif user_choice == "5":
                 current_state = "exit"
             else:
-                print("\nInvalid option. Please select 1, 2, or 3. Press 'Enter' to continue...")
+                print("\nInvalid option. Please select a number from 1 to 5. Press 'Enter' to continue...")
                 input()
                 clear_screen()
 
@@ -299,7 +563,7 @@ if __name__ == "__main__":
             # Update: Syncs existing folders with YouTube playlist changes
             while True:
                 clear_screen()
-                print("### --- YOUTUBE MANAGER --- ###".center(columns) + "\n")
+                print(get_banner() + "\n")
                 print("1 - Download\n2 - Update\n3 - Back to main menu\n4 - Exit\n")
                 user_choice = input("Select an option: ")
 
@@ -310,37 +574,40 @@ if __name__ == "__main__":
                     chosen_format = ask_for_format()
 
                     chosen_quality = None
-                    if chosen_format not in ['mp3', 'm4a', 'flac', 'opus', 'wav']:
+                    if chosen_format not in AUDIO_FORMATS:
                         chosen_quality = ask_for_video_quality()
 
-                    print(f"{utility_words[0][1]}...\n")
+                    use_aria2 = ask_for_aria2()
 
-                    errors = []
+                    print(f"{KEYWORD_BY_CHOICE['1'][1]}...\n")
 
-                    for url in playlists_urls:
-                        # Fetch playlist metadata (title) quickly using config1
-                        with yt_dlp.YoutubeDL(yt_config) as ydl:
-                            info = ydl.extract_info(url, download=False)
-                            if info:
-                                playlist_title = info.get('title', 'Unknown Playlist')
-                                folder_name = sanitize_filename(playlist_title)
-                
-                        # If the folder already exists, suggest to use Update to avoid duplication
-                        if os.path.isdir(folder_name):
-                            print(f"\nThe folder '{folder_name}' already exists. Use the Update option to update it.\nPress 'enter' to continue")
-                            input()
-                            continue
-
-                        # Create destination folder and start downloading playlist entries
-                        os.makedirs(folder_name, exist_ok=True)
-                        # Delegate the resilient per-entry download to core.download_playlist
-                        errors.extend(core.download_playlists(url, folder_name, playlist_title, chosen_format, chosen_quality))
+                    errors = []
+                    # Folders that already exist are skipped and listed at the end, without
+                    # prompting, so the checks never block while downloads are printing
+                    skipped_folders = []
+
+                    # Playlists are independent and network-bound: a few of them are downloaded at the same time.
+                    # Each download starts as soon as its playlist metadata resolves, while the metadata
+                    # of the following playlists is still being fetched by the prefetch pool
+                    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+                        existing_folders = list_existing_folders()
+                        futures = [executor.submit(download_one_playlist, url, chosen_format, chosen_quality, use_aria2, existing_folders) for url in playlists_urls]
+
+                        for future in as_completed(futures):
+                            skipped_folder, playlist_errors = future.result()
+                            if skipped_folder:
+                                skipped_folders.append(skipped_folder)
+                            errors.extend(playlist_errors)
+
+                    if skipped_folders:
+                        print("\nThese folders already exist and were skipped. Use the Update option to update them:")
+                        for folder_name in skipped_folders:
+                            print(f" - '{folder_name}'")
 
                     # Report download errors (if any)
                     if errors:
                         print("\nSome errors occurred during the download:")
-                        for playlist, video, msg in errors:
-                            print(f" - [{playlist}] {video}: {msg}")
+                        print_errors(errors)
 
                         print("\n\nPress Enter to continue")
                         input()
@@ -356,21 +623,33 @@ if __name__ == "__main__":
                     clear_screen()
                     playlists_urls = playlists_urls_aquisition(user_choice)
                     errors = []
+                    fallback_format = None
 
-                    print(f"{utility_words[1][1]}...\n")
+                    print(f"{KEYWORD_BY_CHOICE['2'][1]}...\n")
+
+                    # Updating never creates or removes playlist folders: scan the directory once
+                    existing_folders = list_existing_folders()
 
                     for url in playlists_urls:
-                        info = core.fetch_online_playlist_info(url)
+                        # A playlist already seen whose folder is missing can't be updated:
+                        # tell the user straight away, without querying YouTube
+                        if is_known_but_missing(url, existing_folders):
+                            print(f"\nFolder '{get_cached_folder(url)}' not found. Please use the Download option first.\nPress 'Enter' to continue...")
+                            input()
+                            continue
+
+                        info = get_playlist_info(url)
                         if not info:
-                            errors.append(("Info Error", f"Impossibile ottenere informazioni per l'URL: {url}"))
+                            errors.append(PlaylistError(url, "Info Error", f"Impossibile ottenere informazioni per l'URL: {url}"))
                             continue
 
                         playlist_title = info['title']
                         youtube_videos = info['videos']
                         folder_name = sanitize_filename(playlist_title)
+                        core.cache_playlist_title(url, playlist_title)
 
                         # If local folder doesn't exist, cannot update: ask user to download first
-                        if not os.path.isdir(folder_name):
+                        if folder_name not in existing_folders:
                             print(f"\nFolder '{folder_name}' not found. Please use the Download option first.\nPress 'Enter' to continue...")
                             input()
                             continue
@@ -380,22 +659,23 @@ if __name__ == "__main__":
 
                             errors.extend(core.reorder_local_videos(youtube_videos, playlist_title, folder_name))
 
-                            files_format = core.detect_format(folder_name)
-                            if files_format:
-                                errors.extend(core.download_new_videos(youtube_videos, playlist_title, folder_name, files_format))
-                            else:
-                                files_format = ask_for_format()
-                                errors.extend(core.download_new_videos(youtube_videos, playlist_title, folder_name, files_format))
+                            files_format = core.get_playlist_format(playlist_title, folder_name)
+                            if not files_format:
+                                # Ask only once per update session, then reuse the answer for other unformatted folders
+                                if fallback_format is None:
+                                    fallback_format = ask_for_format()
+                                files_format = fallback_format
+
+                            errors.extend(core.download_new_videos(youtube_videos, playlist_title, folder_name, files_format, max_parallel))
 
                         except Exception as e:
                             # Record the high-level failure for reporting
-                            errors.append((playlist_title, "UPDATE FAILED", f"A critical error occurred: {e}"))
+                            errors.append(PlaylistError(playlist_title, "UPDATE FAILED", f"A critical error occurred: {e}"))
 
                     # Report update errors (if any)
                     if errors:
                         print("\nSome errors occurred during the update:")
-                        for playlist, error_type, error_msg in errors:
-                            print(f" - [{playlist}]: [{error_type}] {error_msg}")
+                        print_errors(errors)
 
                         print("\n\nPress Enter to continue")
                         input()
@@ -428,20 +708,24 @@ if __name__ == "__main__":
             chosen_format = ask_for_format()
 
             chosen_quality = None
-            if chosen_format not in ['mp3', 'm4a', 'flac', 'opus', 'wav']:
+            if chosen_format not in AUDIO_FORMATS:
                 chosen_quality = ask_for_video_quality()
 
-            print(f"{utility_words[0][1]}...\n")
+            use_aria2 = ask_for_aria2()
+
+            print(f"{KEYWORD_BY_CHOICE['1'][1]}...\n")
 
             errors = []
 
-            # Delegate single-video downloads to core.download_video
-            errors.extend(core.download_video(videos_urls, chosen_format, chosen_quality))
+            # Delegate single-video downloads to core.download_video, one call per video
+            # so that a few of them are downloaded at the same time
+            with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+                for video_errors in executor.map(lambda url: core.download_video([url], chosen_format, chosen_quality, use_aria2), videos_urls):
+                    errors.extend(video_errors)
 
             if errors:
                 print("\nSome errors occurred during the download:")
-                for category, video, msg in errors:
-                    print(f" - [{category}] {video}: {msg}")
+                print_errors(errors)
 
                 print("\nPress Enter to continue")
                 input()
@@ -470,8 +754,8 @@ if __name__ == "__main__":
                     input()
                     break    
                 elif confirm == "no":
-                    print("\nOperation cancelled. No data has been deleted.")
-                    sleep(2)
+                    print("\nOperation cancelled. No data has been deleted.\nPress 'Enter' to return to the main menu")
+                    input()
                     break
                 else:
                     print("Invalid option. Press 'Enter' to continue...")